@@ -3,6 +3,8 @@ Interactive selectors for Glance CLI.
 Handles Java and Minecraft version selection with Rich UI.
 """
 
+from concurrent.futures import ThreadPoolExecutor
+
 from rich.console import Console
 from rich.table import Table
 from rich.prompt import Prompt
@@ -49,6 +51,25 @@ def select_java():
     return _prompt_java_selection(java_installations)
 
 
+def _probe_java_installation(java_home: str) -> tuple[str, str]:
+    """Probe one installation for its version and certificate status.
+
+    Each probe spawns up to two subprocesses (java -version, keytool),
+    so probes for separate installations run on a thread pool.
+    """
+    version = get_java_version(java_home)
+    cacerts = find_cacerts(java_home)
+    keytool = get_keytool_executable(java_home)
+
+    if cacerts:
+        installed = check_cert_installed(keytool, cacerts)
+        status = "[bold green]✓ CERT[/]" if installed else "[yellow]○ NO CERT[/]"
+    else:
+        status = "[dim]?[/]"
+
+    return version, status
+
+
 def _build_java_table(java_installations: list) -> Table:
     """Build the Java installations table."""
     table = Table(
@@ -62,17 +83,14 @@ def _build_java_table(java_installations: list) -> Table:
     table.add_column("Path", style="white")
     table.add_column("Version", style="green", width=15)
 
-    for i, java_home in enumerate(java_installations, 1):
-        version = get_java_version(java_home)
-        cacerts = find_cacerts(java_home)
-        keytool = get_keytool_executable(java_home)
-
-        if cacerts:
-            installed = check_cert_installed(keytool, cacerts)
-            status = "[bold green]✓ CERT[/]" if installed else "[yellow]○ NO CERT[/]"
-        else:
-            status = "[dim]?[/]"
+    with ThreadPoolExecutor(
+        max_workers=min(8, len(java_installations))
+    ) as executor:
+        probes = list(executor.map(_probe_java_installation, java_installations))
 
+    for i, (java_home, (version, status)) in enumerate(
+        zip(java_installations, probes), 1
+    ):
         table.add_row(str(i), status, java_home, version)
 
     return table
@@ -108,10 +126,16 @@ def select_minecraft_version(minecraft_dir: str):
 
     page_size = 15
     current_page = 0
-    total_pages = (len(versions) + page_size - 1) // page_size
+    # Slice the version list into pages once; paging through them then
+    # costs nothing per keystroke.
+    pages = [
+        list(enumerate(versions[start : start + page_size], start + 1))
+        for start in range(0, len(versions), page_size)
+    ]
+    total_pages = len(pages)
 
     while True:
-        _display_version_page(versions, current_page, page_size, total_pages)
+        _display_version_page(pages[current_page], current_page, total_pages)
         result = _handle_version_input(versions, current_page, total_pages)
 
         if result == "next":
@@ -122,13 +146,8 @@ def select_minecraft_version(minecraft_dir: str):
             return result
 
 
-def _display_version_page(
-    versions: list, current_page: int, page_size: int, total_pages: int
-):
-    """Display a page of Minecraft versions."""
-    start_idx = current_page * page_size
-    end_idx = min(start_idx + page_size, len(versions))
-
+def _display_version_page(page: list, current_page: int, total_pages: int):
+    """Display one precomputed page of (number, version) rows."""
     table = Table(
         title=f"[bold cyan]Minecraft Versions[/] [dim](Page {current_page + 1}/{total_pages})[/]",
         box=box.ROUNDED,
@@ -137,8 +156,8 @@ def _display_version_page(
     table.add_column("#", style="cyan", justify="center", width=5)
     table.add_column("Version", style="white")
 
-    for i in range(start_idx, end_idx):
-        table.add_row(str(i + 1), versions[i])
+    for number, version in page:
+        table.add_row(str(number), version)
 
     console.print()
     console.print(table)
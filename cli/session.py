@@ -4,6 +4,7 @@ Handles certificate setup and Minecraft launch session.
 """
 
 import os
+import socket
 import subprocess
 import time
 
@@ -87,12 +88,28 @@ def launch_session(java_home: str, minecraft_dir: str, version: str, username: s
     if not mitm_process:
         return
 
-    time.sleep(2)
+    _wait_for_proxy()
 
     mc_process = launch_minecraft(java_home, minecraft_dir, version, username)
     _handle_session(mitm_process, mc_process)
 
 
+def _wait_for_proxy(port: int = 8080, timeout: float = 10.0) -> bool:
+    """Wait until the proxy accepts TCP connections.
+
+    Polling the listening socket replaces the old fixed sleep, so launch
+    continues the moment mitmdump is actually ready.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.25):
+                return True
+        except OSError:
+            time.sleep(0.1)
+    return False
+
+
 def _start_mitm_proxy() -> subprocess.Popen | None:
     """Start the mitmproxy process."""
     try:
@@ -157,7 +174,7 @@ def launch_manual_mode():
     if not mitm_process:
         return
 
-    time.sleep(1)
+    _wait_for_proxy()
     show_manual_mode_panel()
 
     try:
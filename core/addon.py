@@ -13,16 +13,15 @@ if str(project_root) not in sys.path:
 
 from datetime import datetime  # noqa: E402
 from collections import defaultdict  # noqa: E402
-from urllib.parse import urlparse  # noqa: E402
 
 from mitmproxy import http, ctx  # noqa: E402
 from core.config import (  # noqa: E402
     STRICT_MODE,
-    IGNORE_HOSTS,
     LOG_ALL_CONNECTIONS,
     BEHAVIORAL_ANALYSIS,
     MAX_POST_BODY_SIZE,
     MAX_REQUEST_FREQUENCY,
+    is_ignored_host,
 )
 from core.detection import (  # noqa: E402
     is_suspicious_request,
@@ -72,22 +71,19 @@ class GlanceAddon:
             )
 
         if client_hello:
-            if STRICT_MODE:
-                is_known_safe = any(
-                    ignore_host in client_hello for ignore_host in IGNORE_HOSTS
+            is_known_safe = is_ignored_host(client_hello)
+
+            if STRICT_MODE and not is_known_safe:
+                ctx.log.warn(
+                    f"[!] STRICT MODE: blocking {client_hello} (no trusted certificate)"
                 )
-                if not is_known_safe:
-                    ctx.log.warn(
-                        f"[!] STRICT MODE: blocking {client_hello} (no trusted certificate)"
-                    )
-                    return
-
-            for ignore_host in IGNORE_HOSTS:
-                if ignore_host in client_hello:
-                    ctx.log.info(f"[✓] ALLOWED (trusted): {client_hello}")
-                    log_bypassed_connection(client_hello, is_trusted=True)
-                    data.ignore_connection = True
-                    return
+                return
+
+            if is_known_safe:
+                ctx.log.info(f"[✓] ALLOWED (trusted): {client_hello}")
+                log_bypassed_connection(client_hello, is_trusted=True)
+                data.ignore_connection = True
+                return
 
             if BEHAVIORAL_ANALYSIS:
                 self.unknown_hosts.add(client_hello)
@@ -96,35 +92,79 @@ class GlanceAddon:
     def request(self, flow: http.HTTPFlow) -> None:
         """Intercept and analyze HTTP requests."""
         request = flow.request
+
+        # Trusted hosts exit before any body decode or regex work - this
+        # skips the whole scan for multi-MB Minecraft asset downloads.
+        host = request.pretty_host
+        if is_ignored_host(host):
+            return
+
         url = request.pretty_url
+        url_lower = url.lower()
         method = request.method
-        headers = dict(request.headers)
-        body = request.text or ""
-
+        # mitmproxy's Headers supports iteration and case-insensitive
+        # get(); reporting converts to a plain dict only when it writes.
+        headers = request.headers
+
+        # get_content undoes Content-Encoding (gzip/deflate/br) but skips
+        # the str decode - scanning raw_content instead would let a
+        # compressed upload slip past every body check.
+        raw_body = request.get_content(strict=False) or b""
+        oversized = len(raw_body) > MAX_POST_BODY_SIZE
+
+        # Detection runs on the raw bytes; the body is only decoded to
+        # str for the few requests that actually get written to a report.
+        body_text = None
         if LOG_ALL_CONNECTIONS:
-            self._log_detailed_connection(method, url, headers, body)
+            body_text = (request.get_text(strict=False) or "") if raw_body else ""
+            self._log_detailed_connection(method, url, headers, body_text)
 
-        if BEHAVIORAL_ANALYSIS:
-            self._track_request(url, method, body)
+        now = datetime.now()
 
-        is_known_suspicious = is_suspicious_request(url, body)
-        heuristic_score, heuristic_reasons = check_heuristics(
-            url, method, headers, body, self.unknown_hosts
-        )
+        if BEHAVIORAL_ANALYSIS:
+            self._track_request(host, method, raw_body, now)
+
+        # Oversized bodies are flagged on size alone - the verdict is
+        # already decided, so neither the pattern scan nor the per-byte
+        # body heuristics get to walk a multi-MB payload.
+        if oversized:
+            is_known_suspicious = True
+            heuristic_score = 0
+            heuristic_reasons = [
+                f"Large data upload: {len(raw_body)} bytes "
+                f"(threshold: {MAX_POST_BODY_SIZE})"
+            ]
+        else:
+            is_known_suspicious = is_suspicious_request(url_lower, raw_body)
+            heuristic_score, heuristic_reasons = check_heuristics(
+                url,
+                method,
+                headers,
+                raw_body,
+                self.unknown_hosts,
+                url_lower=url_lower,
+                host=host,
+                port=request.port,
+            )
 
-        behavioral_flags = self._check_behavioral_anomalies(url)
+        behavioral_flags = self._check_behavioral_anomalies(host, now)
 
         if is_known_suspicious or (heuristic_score >= 2):
-            reason = (
-                "KNOWN MALWARE"
-                if is_known_suspicious
-                else f"HEURISTIC DETECTION (score={heuristic_score})"
-            )
+            if oversized:
+                reason = f"OVERSIZED BODY ({len(raw_body)} bytes)"
+            elif is_known_suspicious:
+                reason = "KNOWN MALWARE"
+            else:
+                reason = f"HEURISTIC DETECTION (score={heuristic_score})"
             ctx.log.error(f"[!!!] SUSPICIOUS REQUEST [{reason}]: {method} {url}")
             if heuristic_reasons:
                 for r in heuristic_reasons:
                     ctx.log.warn(f"      - {r}")
-            self._handle_suspicious(flow, method, url, headers, body, heuristic_reasons)
+            if body_text is None:
+                body_text = (request.get_text(strict=False) or "") if raw_body else ""
+            self._handle_suspicious(
+                flow, method, url, headers, body_text, raw_body, heuristic_reasons
+            )
         elif heuristic_score > 0 or behavioral_flags:
             ctx.log.warn(
                 f"[?] POTENTIALLY SUSPICIOUS: {method} {url} (score={heuristic_score})"
@@ -132,8 +172,10 @@ class GlanceAddon:
             if heuristic_reasons:
                 for r in heuristic_reasons:
                     ctx.log.info(f"    - {r}")
+            if body_text is None:
+                body_text = (request.get_text(strict=False) or "") if raw_body else ""
             log_suspicious_activity(
-                method, url, headers, body, heuristic_score, heuristic_reasons
+                method, url, headers, body_text, heuristic_score, heuristic_reasons
             )
 
     def _log_detailed_connection(self, method: str, url: str, headers: dict, body: str):
@@ -142,26 +184,20 @@ class GlanceAddon:
 
         log_detailed_request(method, url, headers, body)
 
-    def _track_request(self, url: str, method: str, body: str):
+    def _track_request(self, host: str, method: str, body: bytes, current_time):
         """Track request for behavioral analysis."""
-        parsed = urlparse(url)
-        host = parsed.netloc or parsed.hostname or "unknown"
-        current_time = datetime.now()
         self.request_frequency[host].append(current_time)
 
         if method in ["POST", "PUT"]:
-            self.data_volumes[host] += len(body.encode("utf-8")) if body else 0
+            self.data_volumes[host] += len(body)
 
-    def _check_behavioral_anomalies(self, url: str) -> list[str]:
+    def _check_behavioral_anomalies(self, host: str, current_time) -> list[str]:
         """Check for behavioral anomalies indicating C2 communication."""
         flags = []
-        parsed = urlparse(url)
-        host = parsed.netloc or parsed.hostname or "unknown"
 
         if not BEHAVIORAL_ANALYSIS:
             return flags
 
-        current_time = datetime.now()
         recent_requests = [
             t
             for t in self.request_frequency[host]
@@ -187,11 +223,12 @@ class GlanceAddon:
         url: str,
         headers: dict,
         body: str,
+        raw_body: bytes,
         heuristic_reasons: list[str] | None = None,
     ):
         """Handle a suspicious request by logging and blocking it."""
-        full_text = f"{url}\n{body}"
-        found_tokens = extract_tokens(full_text)
+        full_data = url.encode("utf-8", "replace") + b"\n" + raw_body
+        found_tokens = extract_tokens(full_data)
 
         txt_name, json_name = save_blocked_report(
             method, url, headers, body, found_tokens, heuristic_reasons
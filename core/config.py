@@ -6,8 +6,27 @@ Contains patterns, URLs, and settings for malware detection.
 import re
 from pathlib import Path
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 EXPORT_FOLDER = Path("./exports")
-EXPORT_FOLDER.mkdir(exist_ok=True)
+
+_export_folder_ready = False
+
+
+def ensure_export_folder() -> Path:
+    """Create the exports folder on first use.
+
+    Importing core.config no longer touches the filesystem; anything
+    that writes into EXPORT_FOLDER calls this first.
+    """
+    global _export_folder_ready
+    if not _export_folder_ready:
+        EXPORT_FOLDER.mkdir(exist_ok=True)
+        _export_folder_ready = True
+    return EXPORT_FOLDER
 
 STRICT_MODE = False
 
@@ -48,6 +67,31 @@ PATTERNS = {
     ),
 }
 
+def _build_combined_pattern():
+    """Join all PATTERNS into one alternation with named groups.
+
+    One finditer pass over the body then replaces five separate scans;
+    the matching rule is recovered from match.lastgroup.
+    """
+    parts = []
+    for name, pattern in PATTERNS.items():
+        source = pattern.pattern
+        # A leading (?i) must not end up mid-alternation (SyntaxError on
+        # Python 3.11+); the combined pattern is compiled caseless anyway.
+        if source.startswith("(?i)"):
+            source = source[4:]
+        parts.append(f"(?P<{name}>{source})")
+    return re.compile("|".join(parts), re.IGNORECASE)
+
+
+COMBINED_PATTERN = _build_combined_pattern()
+
+# Bytes twin of COMBINED_PATTERN (the rules are pure ASCII): scanning
+# request.raw_content directly skips a full decode of the body.
+COMBINED_PATTERN_BYTES = re.compile(
+    COMBINED_PATTERN.pattern.encode("ascii"), re.IGNORECASE
+)
+
 SUSPICIOUS_URLS = [
     "api.discord.com/api/webhooks/",
     "discord.com/api/webhooks/",
@@ -76,14 +120,16 @@ SUSPICIOUS_INDICATORS = [
     "base64",
 ]
 
-SUSPICIOUS_HEADERS = [
-    "x-session-token",
-    "x-auth-token",
-    "x-api-key",
-    "x-hwid",
-    "x-client-id",
-    "x-victim-id",
-]
+SUSPICIOUS_HEADERS = frozenset(
+    [
+        "x-session-token",
+        "x-auth-token",
+        "x-api-key",
+        "x-hwid",
+        "x-client-id",
+        "x-victim-id",
+    ]
+)
 
 IGNORE_HOSTS = [
     "files.minecraftforge.net",
@@ -94,3 +140,42 @@ IGNORE_HOSTS = [
     "libraries.minecraft.net",
     "resources.download.minecraft.net",
 ]
+
+
+def _build_automaton(needles):
+    """Build an Aho-Corasick automaton for one-pass substring scanning."""
+    automaton = ahocorasick.Automaton()
+    for needle in needles:
+        automaton.add_word(needle.lower(), needle)
+    automaton.make_automaton()
+    return automaton
+
+
+if ahocorasick is not None:
+    SUSPICIOUS_URL_AUTOMATON = _build_automaton(SUSPICIOUS_URLS)
+    SUSPICIOUS_INDICATOR_AUTOMATON = _build_automaton(SUSPICIOUS_INDICATORS)
+else:
+    SUSPICIOUS_URL_AUTOMATON = None
+    SUSPICIOUS_INDICATOR_AUTOMATON = None
+
+IGNORE_HOSTS_SET = frozenset(IGNORE_HOSTS)
+
+
+def is_ignored_host(hostname: str) -> bool:
+    """Check a hostname/SNI against IGNORE_HOSTS with set lookups.
+
+    Matches the exact hostname or any parent-domain suffix on a label
+    boundary, so "eu.libraries.minecraft.net" is trusted but a hostname
+    that merely *contains* a trusted name (e.g.
+    "launcher.mojang.com.evil.example") is not.
+    """
+    hostname = hostname.lower().rstrip(".")
+    if hostname in IGNORE_HOSTS_SET:
+        return True
+
+    dot = hostname.find(".")
+    while dot != -1:
+        if hostname[dot + 1:] in IGNORE_HOSTS_SET:
+            return True
+        dot = hostname.find(".", dot + 1)
+    return False
@@ -6,25 +6,101 @@ Handles heuristic analysis and pattern matching for suspicious requests.
 import re
 from urllib.parse import urlparse
 
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
 from core.config import (
     PATTERNS,
+    COMBINED_PATTERN_BYTES,
     SUSPICIOUS_URLS,
     SUSPICIOUS_PORT_RANGES,
     SUSPICIOUS_INDICATORS,
     SUSPICIOUS_HEADERS,
     MAX_POST_BODY_SIZE,
+    SUSPICIOUS_URL_AUTOMATON,
+    SUSPICIOUS_INDICATOR_AUTOMATON,
 )
 
 
-def is_suspicious_request(url: str, body: str) -> bool:
-    """Check if a request is suspicious based on URL or content patterns."""
-    for pattern in SUSPICIOUS_URLS:
-        if pattern in url.lower():
-            return True
+def _build_hyperscan_db():
+    """Compile all PATTERNS into a single multi-pattern Hyperscan database.
+
+    One linear scan over the body then replaces the per-pattern re.search
+    loop; matches are reported as (pattern_id, from, to) byte offsets.
+    """
+    expressions = [p.pattern.encode() for p in PATTERNS.values()]
+    flags = [
+        hyperscan.HS_FLAG_SOM_LEFTMOST
+        | (hyperscan.HS_FLAG_CASELESS if p.flags & re.IGNORECASE else 0)
+        for p in PATTERNS.values()
+    ]
+    db = hyperscan.Database()
+    db.compile(
+        expressions=expressions,
+        ids=list(range(len(expressions))),
+        flags=flags,
+    )
+    return db
+
+
+_HS_DB = None
+_HS_SCRATCH = None
+if hyperscan is not None:
+    try:
+        _HS_DB = _build_hyperscan_db()
+        _HS_SCRATCH = hyperscan.Scratch(_HS_DB)
+    except hyperscan.error:
+        _HS_DB = None
+        _HS_SCRATCH = None
+
+
+def _hyperscan_collect(data: bytes) -> list[tuple[int, int, int]]:
+    """Scan data once and collect all (pattern_id, from, to) matches."""
+    matches = []
+
+    def on_match(pattern_id, start, end, flags, context):
+        context.append((pattern_id, start, end))
+
+    _HS_DB.scan(
+        data, match_event_handler=on_match, context=matches, scratch=_HS_SCRATCH
+    )
+    return matches
+
 
-    for pattern in PATTERNS.values():
-        if re.search(pattern, body):
+def _hyperscan_contains_match(data: bytes) -> bool:
+    """Scan data and short-circuit on the first pattern match."""
+    def on_match(pattern_id, start, end, flags, context):
+        return 1  # non-zero terminates the scan early
+
+    try:
+        _HS_DB.scan(data, match_event_handler=on_match, scratch=_HS_SCRATCH)
+    except hyperscan.ScanTerminated:
+        return True
+    return False
+
+
+def is_suspicious_request(url_lower: str, body: bytes) -> bool:
+    """Check if a request is suspicious based on URL or content patterns.
+
+    Expects an already-lowercased URL so the caller can lowercase once
+    per request. The body is scanned as raw bytes - the token patterns
+    are pure ASCII, so no decode of the (possibly binary) payload is
+    needed.
+    """
+    if SUSPICIOUS_URL_AUTOMATON is not None:
+        for _ in SUSPICIOUS_URL_AUTOMATON.iter(url_lower):
             return True
+    else:
+        for pattern in SUSPICIOUS_URLS:
+            if pattern in url_lower:
+                return True
+
+    if body:
+        if _HS_DB is not None:
+            return _hyperscan_contains_match(body)
+        return COMBINED_PATTERN_BYTES.search(body) is not None
 
     return False
 
@@ -33,20 +109,31 @@ def check_heuristics(
     url: str,
     method: str,
     headers: dict,
-    body: str,
+    body: bytes,
     unknown_hosts: set,
+    url_lower: str | None = None,
+    host: str | None = None,
+    port: int | None = None,
 ) -> tuple[int, list[str]]:
     """Check for heuristic indicators of unknown C2 servers.
 
+    The caller may pass the already-known host/port (mitmproxy exposes
+    both on the request) to avoid re-parsing the URL.
+
     Returns:
         Tuple of (score, reasons) where score is the suspicion level
         and reasons is a list of detection reasons.
     """
     score = 0
     reasons = []
-
-    parsed = urlparse(url)
-    host = parsed.netloc or parsed.hostname or "unknown"
+    if url_lower is None:
+        url_lower = url.lower()
+    if host is None or port is None:
+        parsed = urlparse(url)
+        if host is None:
+            host = parsed.netloc or parsed.hostname or "unknown"
+        if port is None:
+            port = parsed.port
 
     if host in unknown_hosts:
         if method in ["POST", "PUT"] and body:
@@ -60,19 +147,19 @@ def check_heuristics(
         score += 2
         reasons.append(f"Direct IP connection: {host}")
 
-    if parsed.port and parsed.port in SUSPICIOUS_PORT_RANGES:
+    if port and port in SUSPICIOUS_PORT_RANGES:
         score += 1
-        reasons.append(f"Suspicious port: {parsed.port}")
+        reasons.append(f"Suspicious port: {port}")
 
     if method in ["POST", "PUT"] and body:
-        body_size = len(body.encode("utf-8"))
+        body_size = len(body)
         if body_size > MAX_POST_BODY_SIZE:
             score += 3
             reasons.append(
                 f"Large data upload: {body_size} bytes (threshold: {MAX_POST_BODY_SIZE})"
             )
 
-    score, reasons = _check_url_indicators(url, score, reasons)
+    score, reasons = _check_url_indicators(url_lower, score, reasons)
     score, reasons = _check_suspicious_headers(headers, score, reasons)
     score, reasons = _check_base64_obfuscation(body, score, reasons)
     score, reasons = _check_user_agent(headers, host, unknown_hosts, score, reasons)
@@ -81,13 +168,21 @@ def check_heuristics(
     return score, reasons
 
 
-def _check_url_indicators(url: str, score: int, reasons: list) -> tuple[int, list]:
-    """Check for suspicious URL path indicators."""
-    for indicator in SUSPICIOUS_INDICATORS:
-        if indicator in url.lower():
+def _check_url_indicators(
+    url_lower: str, score: int, reasons: list
+) -> tuple[int, list]:
+    """Check for suspicious URL path indicators (URL already lowercased)."""
+    if SUSPICIOUS_INDICATOR_AUTOMATON is not None:
+        for _, indicator in SUSPICIOUS_INDICATOR_AUTOMATON.iter(url_lower):
             score += 1
             reasons.append(f"Suspicious URL pattern: {indicator}")
             break
+    else:
+        for indicator in SUSPICIOUS_INDICATORS:
+            if indicator in url_lower:
+                score += 1
+                reasons.append(f"Suspicious URL pattern: {indicator}")
+                break
     return score, reasons
 
 
@@ -102,13 +197,17 @@ def _check_suspicious_headers(
     return score, reasons
 
 
-def _check_base64_obfuscation(body: str, score: int, reasons: list) -> tuple[int, list]:
+_BASE64_BYTES = frozenset(
+    b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/="
+)
+
+
+def _check_base64_obfuscation(
+    body: bytes, score: int, reasons: list
+) -> tuple[int, list]:
     """Check for high ratio of base64 characters indicating obfuscation."""
     if body and len(body) > 100:
-        base64_chars = sum(
-            c in "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/="
-            for c in body
-        )
+        base64_chars = sum(c in _BASE64_BYTES for c in body)
         if base64_chars / len(body) > 0.8:
             score += 2
             reasons.append("High base64 content ratio (potential obfuscation)")
@@ -128,35 +227,93 @@ def _check_user_agent(
 
 
 def _check_credential_fields(
-    body: str, method: str, score: int, reasons: list
+    body: bytes, method: str, score: int, reasons: list
 ) -> tuple[int, list]:
     """Check for credential-like fields in request body."""
     if body and method in ["POST", "PUT"]:
         credential_keywords = [
-            "password",
-            "token",
-            "session",
-            "cookie",
-            "auth",
-            "key",
-            "secret",
+            b"password",
+            b"token",
+            b"session",
+            b"cookie",
+            b"auth",
+            b"key",
+            b"secret",
         ]
+        body_lower = body.lower()
         for keyword in credential_keywords:
-            if keyword in body.lower():
+            if keyword in body_lower:
                 score += 2
                 reasons.append(
-                    f"Potential credential exfiltration: contains '{keyword}'"
+                    f"Potential credential exfiltration: contains '{keyword.decode()}'"
                 )
                 break
     return score, reasons
 
 
-def extract_tokens(text: str) -> dict:
-    """Extract tokens and API keys from text."""
+def extract_tokens(data: bytes) -> dict:
+    """Extract tokens and API keys from raw request data.
+
+    Only the handful of matched slices are ever decoded to str - the
+    full buffer stays as bytes.
+    """
+    if _HS_DB is not None:
+        return _extract_tokens_hyperscan(data)
+
+    found = {}
+    for match in COMBINED_PATTERN_BYTES.finditer(data):
+        name = match.lastgroup
+        token = _confirm_token(name, match.group(name))
+        if token is not None:
+            _add_token(found, name, token)
+    return {name: list(tokens) for name, tokens in found.items()}
+
+
+def _add_token(found: dict, name: str, token: str):
+    """Add a token to its per-rule set without allocating a set per hit."""
+    tokens = found.get(name)
+    if tokens is None:
+        tokens = found[name] = set()
+    tokens.add(token)
+
+
+def _confirm_token(name: str, candidate: bytes) -> str | None:
+    """Re-run a single pattern on a matched slice to pull out the token.
+
+    The fast scanners report whole-match bytes only (the combined pattern
+    is also caseless across all rules), so the original pattern is used
+    to confirm the hit and recover the captured value, e.g. the value
+    part of an api_key match.
+    """
+    match = PATTERNS[name].search(candidate.decode("ascii", "replace"))
+    if not match:
+        return None
+    groups = match.groups()
+    return groups[1] if len(groups) >= 2 else match.group(0)
+
+
+_PATTERN_NAMES = tuple(PATTERNS)
+
+
+def _extract_tokens_hyperscan(data: bytes) -> dict:
+    """Extract tokens via one Hyperscan pass, slicing only the matched spans.
+
+    Hyperscan reports a match at every valid end offset, so a rule with
+    an open-ended tail ({38,} etc.) fires once per extra character.
+    Keep only the longest end per (pattern, start) so each real token is
+    confirmed once, matching the leftmost-longest output of the re path.
+    """
+    spans: dict[tuple[int, int], int] = {}
+    for pattern_id, start, end in _hyperscan_collect(data):
+        key = (pattern_id, start)
+        if end > spans.get(key, -1):
+            spans[key] = end
+
     found = {}
-    for name, pattern in PATTERNS.items():
-        matches = pattern.findall(text)
-        if matches:
-            cleaned = [m[1] if isinstance(m, tuple) else m for m in matches]
-            found[name] = list(set(cleaned))
-    return found
+    for (pattern_id, start), end in spans.items():
+        name = _PATTERN_NAMES[pattern_id]
+        token = _confirm_token(name, data[start:end])
+        if token is not None:
+            _add_token(found, name, token)
+
+    return {name: list(tokens) for name, tokens in found.items()}
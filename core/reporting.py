@@ -1,13 +1,92 @@
 """
 Logging utilities for Glance addon.
 Handles connection logging and suspicious activity reporting.
+File writes happen on a background thread so the proxy event loop
+never blocks on disk I/O.
 """
 
+import atexit
 import json
 import hashlib
+import queue
+import sys
+import threading
 from datetime import datetime
 
-from core.config import EXPORT_FOLDER
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Fragment (embed pre-serialized JSON) appeared in orjson 3.9.
+_ORJSON_FRAGMENT = getattr(orjson, "Fragment", None)
+
+from core.config import EXPORT_FOLDER, ensure_export_folder
+
+_write_queue: queue.Queue = queue.Queue()
+_writer_thread: threading.Thread | None = None
+_writer_lock = threading.Lock()
+
+
+def _writer_loop():
+    """Drain the write queue, executing one file-write job at a time."""
+    while True:
+        job = _write_queue.get()
+        try:
+            if job is None:
+                break
+            func, args = job
+            try:
+                func(*args)
+            except Exception as e:
+                # A failed report write must never take down the proxy,
+                # but a silently dropped report is its entire output -
+                # leave a trace on stderr (the worker runs outside the
+                # mitmproxy event loop).
+                target = args[0] if args else func.__name__
+                print(f"glance: failed to write {target}: {e}", file=sys.stderr)
+        finally:
+            _write_queue.task_done()
+
+
+def _flush_writes():
+    """Block until every queued report write has hit disk."""
+    _write_queue.join()
+
+
+def _enqueue_write(func, *args):
+    """Queue a file write on the background reporter thread."""
+    global _writer_thread
+    if _writer_thread is None:
+        with _writer_lock:
+            if _writer_thread is None:
+                ensure_export_folder()
+                thread = threading.Thread(
+                    target=_writer_loop, name="glance-report-writer", daemon=True
+                )
+                thread.start()
+                atexit.register(_flush_writes)
+                _writer_thread = thread
+    _write_queue.put((func, args))
+
+
+def _content_hash(url: str, body: str) -> str:
+    """Short content fingerprint for report filenames.
+
+    BLAKE2b is considerably faster than MD5 on large bodies; 128 bits is
+    ample for an 8-hex-char filename disambiguator. The hash is fed
+    incrementally so no url+body concatenation is ever built.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(url.encode("utf-8", "replace"))
+    h.update(body.encode("utf-8", "replace"))
+    return h.hexdigest()[:8]
+
+
+def _append_log(filename: str, text: str):
+    """Append pre-formatted text to a log file in the export folder."""
+    with open(EXPORT_FOLDER / filename, "a", encoding="utf-8") as f:
+        f.write(text)
 
 
 def log_connection(
@@ -24,17 +103,23 @@ def log_connection(
         }
     )
 
-    log_file = EXPORT_FOLDER / "all_connections.log"
-    with open(log_file, "a", encoding="utf-8") as f:
-        f.write(
-            f"[{timestamp.strftime('%Y-%m-%d %H:%M:%S')}] {hostname} "
-            f"(encrypted={is_encrypted}, sni={has_sni})\n"
-        )
+    _enqueue_write(
+        _append_log,
+        "all_connections.log",
+        f"[{timestamp.strftime('%Y-%m-%d %H:%M:%S')}] {hostname} "
+        f"(encrypted={is_encrypted}, sni={has_sni})\n",
+    )
 
 
 def log_detailed_request(method: str, url: str, headers: dict, body: str):
     """Log detailed request information with headers and body."""
     timestamp = datetime.now()
+    _enqueue_write(
+        _write_detailed_request, timestamp, method, url, dict(headers), body
+    )
+
+
+def _write_detailed_request(timestamp, method: str, url: str, headers: dict, body: str):
     log_file = EXPORT_FOLDER / "all_connections.log"
 
     with open(log_file, "a", encoding="utf-8") as f:
@@ -44,7 +129,7 @@ def log_detailed_request(method: str, url: str, headers: dict, body: str):
         f.write(f"Method: {method}\n")
         f.write(f"URL: {url}\n")
         f.write("\n--- Headers ---\n")
-        f.write(json.dumps(headers, indent=2, ensure_ascii=False))
+        json.dump(headers, f, indent=2, ensure_ascii=False)
         f.write("\n\n--- Body ---\n")
         if body:
             if len(body) > 10000:
@@ -59,33 +144,57 @@ def log_detailed_request(method: str, url: str, headers: dict, body: str):
 def log_bypassed_connection(hostname: str, is_trusted: bool = False):
     """Log connections that bypass MITM interception."""
     timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-    log_file = EXPORT_FOLDER / "bypassed_connections.log"
 
-    with open(log_file, "a", encoding="utf-8") as f:
-        if is_trusted:
-            f.write(f"[{timestamp}] TRUSTED HOST BYPASSED: {hostname}\n")
-            f.write("  [✓] Known legitimate Minecraft infrastructure\n\n")
-        else:
-            f.write(f"[{timestamp}] BYPASSED (NO MITM): {hostname}\n")
-            f.write(
-                "  [!] Connection bypassed without decryption - content not verified!\n"
-            )
-            f.write("  [i] Enable STRICT_MODE=True to block\n\n")
+    if is_trusted:
+        text = (
+            f"[{timestamp}] TRUSTED HOST BYPASSED: {hostname}\n"
+            "  [✓] Known legitimate Minecraft infrastructure\n\n"
+        )
+    else:
+        text = (
+            f"[{timestamp}] BYPASSED (NO MITM): {hostname}\n"
+            "  [!] Connection bypassed without decryption - content not verified!\n"
+            "  [i] Enable STRICT_MODE=True to block\n\n"
+        )
+    _enqueue_write(_append_log, "bypassed_connections.log", text)
 
 
 def log_suspicious_activity(
     method: str, url: str, headers: dict, body: str, score: int, reasons: list[str]
 ):
     """Log potentially suspicious activity for review."""
-    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-    content_hash = hashlib.md5((url + body).encode()).hexdigest()[:8]
-    base_name = f"{timestamp}_{content_hash}_potential"
+    timestamp = datetime.now()
+    content_hash = _content_hash(url, body)
+    base_name = f"{timestamp.strftime('%Y-%m-%d_%H-%M-%S')}_{content_hash}_potential"
 
     log_file = EXPORT_FOLDER / f"{base_name}.txt"
-    with open(log_file, "w", encoding="utf-8") as f:
+    _enqueue_write(
+        _write_suspicious_activity,
+        log_file,
+        timestamp,
+        method,
+        url,
+        dict(headers),
+        body,
+        score,
+        list(reasons),
+    )
+
+
+def _write_suspicious_activity(
+    filepath,
+    timestamp,
+    method: str,
+    url: str,
+    headers: dict,
+    body: str,
+    score: int,
+    reasons: list,
+):
+    with open(filepath, "w", encoding="utf-8") as f:
         f.write("GLANCE - POTENTIAL THREAT DETECTED\n")
         f.write("=" * 50 + "\n")
-        f.write(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        f.write(f"Time: {timestamp.strftime('%Y-%m-%d %H:%M:%S')}\n")
         f.write(f"Heuristic Score: {score}\n")
         f.write(f"Method: {method}\n")
         f.write(f"URL: {url}\n\n")
@@ -96,7 +205,7 @@ def log_suspicious_activity(
         f.write("\n")
 
         f.write("Headers:\n")
-        f.write(json.dumps(headers, indent=2, ensure_ascii=False))
+        json.dump(headers, f, indent=2, ensure_ascii=False)
         f.write("\n\nRequest Body (first 1000 chars):\n")
         f.write(body[:1000] if body else "(empty)")
 
@@ -111,29 +220,64 @@ def save_blocked_report(
 ) -> tuple[str, str]:
     """Save human-readable and machine-readable reports for blocked requests.
 
+    The filenames are computed synchronously; the actual writes are
+    queued on the background reporter thread.
+
     Returns:
         Tuple of (txt_filename, json_filename)
     """
-    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-    content_hash = hashlib.md5((url + body).encode()).hexdigest()[:8]
-    base_name = f"{timestamp}_{content_hash}"
+    timestamp = datetime.now()
+    content_hash = _content_hash(url, body)
+    base_name = f"{timestamp.strftime('%Y-%m-%d_%H-%M-%S')}_{content_hash}"
+
+    headers_snapshot = dict(headers)
+    # Serialize the headers once; both report writers reuse the result.
+    headers_json = _serialize_headers(headers_snapshot)
 
     txt_file = EXPORT_FOLDER / f"{base_name}_BLOCKED.txt"
-    _write_txt_report(
-        txt_file, method, url, headers, body, found_tokens, heuristic_reasons
+    _enqueue_write(
+        _write_txt_report,
+        txt_file,
+        timestamp,
+        method,
+        url,
+        headers_snapshot,
+        headers_json,
+        body,
+        found_tokens,
+        heuristic_reasons,
     )
 
     json_file = EXPORT_FOLDER / f"{base_name}_intercept.json"
-    _write_json_report(json_file, method, url, headers, body, found_tokens)
+    _enqueue_write(
+        _write_json_report,
+        json_file,
+        timestamp,
+        method,
+        url,
+        headers_snapshot,
+        headers_json,
+        body,
+        found_tokens,
+    )
 
     return txt_file.name, json_file.name
 
 
+def _serialize_headers(headers: dict) -> bytes:
+    """Serialize headers to indented JSON bytes (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(headers, option=orjson.OPT_INDENT_2)
+    return json.dumps(headers, indent=2, ensure_ascii=False).encode()
+
+
 def _write_txt_report(
     filepath,
+    timestamp,
     method: str,
     url: str,
     headers: dict,
+    headers_json: bytes,
     body: str,
     found_tokens: dict,
     heuristic_reasons: list[str] | None,
@@ -142,7 +286,7 @@ def _write_txt_report(
     with open(filepath, "w", encoding="utf-8") as f:
         f.write("GLANCE - MALICIOUS REQUEST BLOCKED\n")
         f.write("=" * 50 + "\n")
-        f.write(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        f.write(f"Time: {timestamp.strftime('%Y-%m-%d %H:%M:%S')}\n")
         f.write(f"Method: {method}\n")
         f.write(f"URL: {url}\n")
         f.write(f"User-Agent: {headers.get('User-Agent', 'N/A')}\n\n")
@@ -162,26 +306,38 @@ def _write_txt_report(
             f.write("\n")
 
         f.write("Headers:\n")
-        f.write(json.dumps(headers, indent=2, ensure_ascii=False))
+        f.write(headers_json.decode("utf-8"))
         f.write("\n\nRequest Body:\n")
         f.write(body if body else "(empty)")
 
 
 def _write_json_report(
-    filepath, method: str, url: str, headers: dict, body: str, found_tokens: dict
+    filepath,
+    timestamp,
+    method: str,
+    url: str,
+    headers: dict,
+    headers_json: bytes,
+    body: str,
+    found_tokens: dict,
 ):
     """Write machine-readable JSON report."""
-    with open(filepath, "w", encoding="utf-8") as f:
-        json.dump(
-            {
-                "timestamp": datetime.now().isoformat(),
-                "method": method,
-                "url": url,
-                "headers": headers,
-                "body": body,
-                "extracted_tokens": found_tokens,
-            },
-            f,
-            indent=2,
-            ensure_ascii=False,
-        )
+    report = {
+        "timestamp": timestamp.isoformat(),
+        "method": method,
+        "url": url,
+        # Reuse the headers JSON shared with the txt report; without
+        # Fragment support the fallback re-serializes the dict.
+        "headers": _ORJSON_FRAGMENT(headers_json)
+        if _ORJSON_FRAGMENT is not None
+        else headers,
+        "body": body,
+        "extracted_tokens": found_tokens,
+    }
+
+    if orjson is not None:
+        with open(filepath, "wb") as f:
+            f.write(orjson.dumps(report, option=orjson.OPT_INDENT_2))
+    else:
+        with open(filepath, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
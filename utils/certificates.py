@@ -17,9 +17,11 @@ def get_java_major_version(java_home):
             java_home, "bin", "java.exe" if os.name == "nt" else "java"
         )
         result = subprocess.run(
-            [java_exe, "-version"], capture_output=True, text=True, timeout=5
+            [java_exe, "-version"], capture_output=True, timeout=5
+        )
+        version_output = (result.stderr if result.stderr else result.stdout).decode(
+            "utf-8", "replace"
         )
-        version_output = result.stderr if result.stderr else result.stdout
 
         for line in version_output.split("\n"):
             if "version" in line.lower():
@@ -99,7 +101,8 @@ def check_cert_installed(keytool, cacerts_path, alias="mitmproxy", java_home=Non
             "changeit",
         ]
 
-    result = subprocess.run(cmd, capture_output=True, text=True)
+    # Only the exit code matters here, so the output stays undecoded.
+    result = subprocess.run(cmd, capture_output=True)
     return result.returncode == 0
 
 
@@ -155,24 +158,38 @@ def install_cert_to_java(java_home, cert_path):
 
     try:
         if current_os != "windows":
-            result = subprocess.run(install_cmd, capture_output=True, text=True)
-            if result.returncode != 0 and "permission" in result.stderr.lower():
+            result = subprocess.run(install_cmd, capture_output=True)
+            if result.returncode != 0 and b"permission" in result.stderr.lower():
                 install_cmd = ["sudo"] + install_cmd
-                result = subprocess.run(install_cmd, capture_output=True, text=True)
+                result = subprocess.run(install_cmd, capture_output=True)
         else:
-            result = subprocess.run(install_cmd, capture_output=True, text=True)
+            result = subprocess.run(install_cmd, capture_output=True)
 
         if result.returncode == 0:
             print(f"  [OK] Certificate installed in {java_home}")
             return True
         else:
-            print(f"  [X] Installation error: {result.stderr}")
+            print(f"  [X] Installation error: {result.stderr.decode('utf-8', 'replace')}")
             return False
     except Exception as e:
         print(f"  [X] Error: {e}")
         return False
 
 
+def _wait_for_file(path, timeout=15.0, interval=0.1):
+    """Poll until a file appears, returning True as soon as it does.
+
+    Replaces a fixed sleep: a fast machine finishes in a fraction of a
+    second, a slow one still gets the full timeout.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if os.path.exists(path):
+            return True
+        time.sleep(interval)
+    return os.path.exists(path)
+
+
 def generate_mitmproxy_cert():
     """Generate the mitmproxy CA certificate if it doesn't exist."""
     home = os.path.expanduser("~")
@@ -192,7 +209,7 @@ def generate_mitmproxy_cert():
             stdout=subprocess.DEVNULL,
             stderr=subprocess.DEVNULL,
         )
-        time.sleep(2)
+        _wait_for_file(cert_path)
         process.terminate()
         process.wait()
 
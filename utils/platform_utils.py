@@ -28,17 +28,20 @@ def find_java_installations():
     current_os = get_platform()
 
     try:
+        # capture_output without text=True keeps the pipes in bytes mode;
+        # the output is decoded once instead of through a TextIOWrapper.
         if current_os == "windows":
             result = subprocess.run(
-                ["where", "java"], capture_output=True, text=True, timeout=10
+                ["where", "java"], capture_output=True, timeout=10
             )
         else:
             result = subprocess.run(
-                ["which", "-a", "java"], capture_output=True, text=True, timeout=10
+                ["which", "-a", "java"], capture_output=True, timeout=10
             )
 
         if result.returncode == 0:
-            for line in result.stdout.strip().split("\n"):
+            stdout = result.stdout.decode("utf-8", "replace")
+            for line in stdout.strip().split("\n"):
                 line = line.strip()
                 if line and os.path.exists(line):
                     java_home = get_java_home_from_executable(line)
@@ -168,9 +171,9 @@ def get_java_version(java_home):
 
     try:
         result = subprocess.run(
-            [java_exe, "-version"], capture_output=True, text=True, timeout=10
+            [java_exe, "-version"], capture_output=True, timeout=10
         )
-        output = result.stderr + result.stdout
+        output = (result.stderr + result.stdout).decode("utf-8", "replace")
         for line in output.split("\n"):
             if "version" in line.lower():
                 match = re.search(r'"([^"]+)"', line)